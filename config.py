@@ -5,64 +5,77 @@ Defines file patterns, size thresholds, and review tags.
 
 import os
 import re
-from typing import List, Pattern
+from functools import lru_cache
+from typing import FrozenSet, List, Optional, Pattern, Tuple
+
+
+def _combine_patterns(patterns: List[str]) -> Pattern[str]:
+    """combine regex patterns into a single alternation matched in one pass."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
 
 
 class Config:
     """Configuration class for MR Bot settings."""
 
-    # file skip patterns (regex)
-    SKIP_PATTERNS: List[Pattern[str]] = [
+    # file skip rules (matched against the lowercased path)
+    SKIP_SUFFIXES: Tuple[str, ...] = (
         # lock files
-        re.compile(r".*\.lock$"),
-        re.compile(r"package-lock\.json$"),
-        re.compile(r"yarn\.lock$"),
-        re.compile(r"poetry\.lock$"),
-        re.compile(r"Pipfile\.lock$"),
-        re.compile(r"composer\.lock$"),
-        re.compile(r"Gemfile\.lock$"),
-        re.compile(r"Cargo\.lock$"),
+        ".lock",
         # build artifacts
-        re.compile(r".*\.min\.(js|css)$"),
-        re.compile(r".*dist/.*"),
-        re.compile(r".*build/.*"),
-        re.compile(r".*target/.*"),
-        re.compile(r".*\.egg-info/.*"),
-        re.compile(r".*__pycache__/.*"),
-        re.compile(r".*\.pyc$"),
-        re.compile(r".*\.pyo$"),
+        ".min.js",
+        ".min.css",
+        ".pyc",
+        ".pyo",
         # generated code
-        re.compile(r".*_pb2\.py$"),
-        re.compile(r".*\.generated\..*"),
-        re.compile(r".*\.pb\.go$"),
-        re.compile(r".*\.pb\.js$"),
+        "_pb2.py",
+        ".pb.go",
+        ".pb.js",
         # binaries and media
-        re.compile(r".*\.(png|jpg|jpeg|gif|svg|ico|webp|bmp)$"),
-        re.compile(r".*\.(pdf|zip|tar|gz|bz2|xz)$"),
-        re.compile(r".*\.(mp3|mp4|avi|mov|wmv)$"),
-        re.compile(r".*\.(woff|woff2|ttf|eot|otf)$"),
-    ]
+        *(f".{ext}" for ext in ("png", "jpg", "jpeg", "gif", "svg", "ico", "webp", "bmp")),
+        *(f".{ext}" for ext in ("pdf", "zip", "tar", "gz", "bz2", "xz")),
+        *(f".{ext}" for ext in ("mp3", "mp4", "avi", "mov", "wmv")),
+        *(f".{ext}" for ext in ("woff", "woff2", "ttf", "eot", "otf")),
+    )
+    SKIP_BASENAMES: FrozenSet[str] = frozenset(
+        {
+            # lock files without a .lock suffix
+            "package-lock.json",
+        }
+    )
+    SKIP_SUBSTRINGS: Tuple[str, ...] = (
+        # build artifacts
+        "dist/",
+        "build/",
+        "target/",
+        ".egg-info/",
+        "__pycache__/",
+        # generated code
+        ".generated.",
+    )
 
     # files to note but skip AI review (large data files)
-    NOTE_ONLY_PATTERNS: List[Pattern[str]] = [
-        re.compile(r".*\.csv$"),
-        re.compile(r".*\.tsv$"),
-        re.compile(r".*\.json\.gz$"),
-        re.compile(r".*\.parquet$"),
-    ]
+    NOTE_ONLY_SUFFIXES: Tuple[str, ...] = (
+        ".csv",
+        ".tsv",
+        ".json.gz",
+        ".parquet",
+    )
 
-    # critical path patterns (higher priority)
-    CRITICAL_PATTERNS: List[Pattern[str]] = [
-        re.compile(r".*auth.*", re.IGNORECASE),
-        re.compile(r".*security.*", re.IGNORECASE),
-        re.compile(r".*api.*", re.IGNORECASE),
-        re.compile(r".*middleware.*", re.IGNORECASE),
-        re.compile(r".*config.*", re.IGNORECASE),
-        re.compile(r".*settings.*", re.IGNORECASE),
-        re.compile(r".*database.*", re.IGNORECASE),
-        re.compile(r".*db.*", re.IGNORECASE),
+    # critical path patterns (higher priority; searched in the lowercased path)
+    CRITICAL_PATTERNS: List[str] = [
+        r"auth",
+        r"security",
+        r"api",
+        r"middleware",
+        r"config",
+        r"settings",
+        r"database",
+        r"db",
     ]
 
+    # combined pattern (one regex scan per lookup instead of one per pattern)
+    CRITICAL_RE: Pattern[str] = _combine_patterns(CRITICAL_PATTERNS)
+
     # size thresholds
     MAX_FILE_SIZE_KB: int = int(os.getenv("MAX_FILE_SIZE_KB", "500"))
     CHUNK_SIZE_LINES: int = int(os.getenv("CHUNK_SIZE_LINES", "300"))
@@ -88,27 +101,61 @@ class Config:
     # output configuration
     DEFAULT_OUTPUT_DIR: str = os.getenv("DEFAULT_OUTPUT_DIR", "./output")
 
+    # the classification methods match against the lowercased path; callers that already
+    # have it can pass filepath_lower to avoid lowercasing the path again
+
     @classmethod
-    def should_skip_file(cls, filepath: str) -> bool:
+    def should_skip_file(cls, filepath: str, filepath_lower: Optional[str] = None) -> bool:
         """check if a file should be skipped entirely."""
-        return any(pattern.match(filepath) for pattern in cls.SKIP_PATTERNS)
+        return _should_skip_file(filepath_lower if filepath_lower is not None else filepath.lower())
 
     @classmethod
-    def should_note_only(cls, filepath: str) -> bool:
+    def should_note_only(cls, filepath: str, filepath_lower: Optional[str] = None) -> bool:
         """check if a file should be noted but not reviewed by AI."""
-        return any(pattern.match(filepath) for pattern in cls.NOTE_ONLY_PATTERNS)
+        return _should_note_only(filepath_lower if filepath_lower is not None else filepath.lower())
 
     @classmethod
-    def is_critical_path(cls, filepath: str) -> bool:
+    def is_critical_path(cls, filepath: str, filepath_lower: Optional[str] = None) -> bool:
         """check if a file is in a critical path (higher priority)."""
-        return any(pattern.match(filepath) for pattern in cls.CRITICAL_PATTERNS)
+        return _is_critical_path(filepath_lower if filepath_lower is not None else filepath.lower())
 
     @classmethod
-    def get_file_priority(cls, filepath: str) -> str:
+    def get_file_priority(cls, filepath: str, filepath_lower: Optional[str] = None) -> str:
         """get priority level for a file: 'critical', 'normal', or 'low'."""
-        if cls.is_critical_path(filepath):
-            return "critical"
-        # test files are lower priority
-        if "test" in filepath.lower() or "spec" in filepath.lower():
-            return "low"
-        return "normal"
+        return _get_file_priority(filepath_lower if filepath_lower is not None else filepath.lower())
+
+
+# classification results are pure functions of the lowercased path, so they are
+# cached to avoid repeating the work when the same path is classified again
+
+# bound matcher, resolved once instead of per lookup
+_critical_search = Config.CRITICAL_RE.search
+
+
+@lru_cache(maxsize=4096)
+def _should_skip_file(filepath_lower: str) -> bool:
+    return (
+        filepath_lower.endswith(Config.SKIP_SUFFIXES)
+        or filepath_lower.rpartition("/")[2] in Config.SKIP_BASENAMES
+        or any(substring in filepath_lower for substring in Config.SKIP_SUBSTRINGS)
+    )
+
+
+@lru_cache(maxsize=4096)
+def _should_note_only(filepath_lower: str) -> bool:
+    return filepath_lower.endswith(Config.NOTE_ONLY_SUFFIXES)
+
+
+@lru_cache(maxsize=4096)
+def _is_critical_path(filepath_lower: str) -> bool:
+    return _critical_search(filepath_lower) is not None
+
+
+@lru_cache(maxsize=4096)
+def _get_file_priority(filepath_lower: str) -> str:
+    if _critical_search(filepath_lower) is not None:
+        return "critical"
+    # test files are lower priority
+    if "test" in filepath_lower or "spec" in filepath_lower:
+        return "low"
+    return "normal"
@@ -3,19 +3,20 @@ Processes file diffs and chunks large files intelligently.
 """
 
 from dataclasses import dataclass
-from typing import List
+from itertools import accumulate
+from typing import Iterator, List
 
 from config import Config
 from file_filter import FilteredFile
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DiffChunk:
     """represents a chunk of a diff file."""
 
     filepath: str
     chunk_number: int
-    content: str
+    content: bytes  # raw UTF-8 diff text
     start_line: int
     end_line: int
     total_chunks: int
@@ -28,52 +29,54 @@ class DiffProcessor:
         """initialize diff processor."""
         pass
 
-    def process_file(self, filtered_file: FilteredFile) -> List[DiffChunk]:
+    def process_file(self, filtered_file: FilteredFile) -> Iterator[DiffChunk]:
         """process a filtered file into chunks if needed.
 
         Args:
             filtered_file: filtered file to process
 
-        Returns:
-            list of diff chunks (single chunk if file is small)
+        Yields:
+            diff chunks (single chunk if file is small)
         """
         filepath = filtered_file.file_change.new_path or filtered_file.file_change.old_path
         diff_content = filtered_file.file_change.diff
 
         if not filtered_file.should_chunk:
-            # return single chunk for small files
-            return [
-                DiffChunk(
-                    filepath=filepath,
-                    chunk_number=1,
-                    content=diff_content,
-                    start_line=1,
-                    end_line=filtered_file.line_count,
-                    total_chunks=1,
-                )
-            ]
-
-        # chunk large files
-        return self._chunk_diff(filepath, diff_content)
-
-    def _chunk_diff(self, filepath: str, diff_content: str) -> List[DiffChunk]:
+            # single chunk for small files
+            yield DiffChunk(
+                filepath=filepath,
+                chunk_number=1,
+                content=diff_content,
+                start_line=1,
+                end_line=filtered_file.line_count,
+                total_chunks=1,
+            )
+            return
+
+        # chunk large files (reusing the lines already split by the file filter)
+        lines = filtered_file.lines if filtered_file.lines is not None else diff_content.split(b"\n")
+        # the split lines are only needed while chunking; don't keep them alive on the filtered file
+        filtered_file.lines = None
+        yield from self._chunk_diff(filepath, diff_content, lines)
+
+    def _chunk_diff(self, filepath: str, diff_content: bytes, lines: List[bytes]) -> Iterator[DiffChunk]:
         """chunk a large diff into smaller pieces.
 
         Args:
             filepath: path to the file
             diff_content: full diff content
+            lines: full diff content split into lines
 
-        Returns:
-            list of diff chunks
+        Yields:
+            diff chunks
         """
-        lines = diff_content.split("\n")
         total_lines = len(lines)
-        chunks = []
         chunk_size = Config.CHUNK_SIZE_LINES
-        context_lines = Config.CONTEXT_LINES
+        context_lines = max(Config.CONTEXT_LINES, 0)
 
+        # compute chunk boundaries first so every chunk is created with its final total
+        boundaries = []
         current_pos = 0
-        chunk_num = 1
 
         while current_pos < total_lines:
             # determine chunk end
@@ -87,38 +90,27 @@ class DiffProcessor:
                 if breakpoint_pos > current_pos:
                     chunk_end = breakpoint_pos
 
-            # extract chunk lines
-            chunk_lines = lines[current_pos:chunk_end]
-            chunk_content = "\n".join(chunk_lines)
-
-            # add context from next chunk if available
-            if chunk_end < total_lines and context_lines > 0:
-                next_context = lines[chunk_end : min(chunk_end + context_lines, total_lines)]
-                if next_context:
-                    chunk_content += "\n" + "\n".join(next_context)
-
-            chunks.append(
-                DiffChunk(
-                    filepath=filepath,
-                    chunk_number=chunk_num,
-                    content=chunk_content,
-                    start_line=current_pos + 1,
-                    end_line=chunk_end,
-                    total_chunks=0,  # will be set after all chunks are created
-                )
-            )
-
+            boundaries.append((current_pos, chunk_end))
             current_pos = chunk_end
-            chunk_num += 1
 
-        # update total_chunks for all chunks
-        for chunk in chunks:
-            chunk.total_chunks = len(chunks)
-
-        return chunks
+        # offset of the start of each line in diff_content (plus one past the end)
+        offsets = [0, *accumulate(len(line) + 1 for line in lines)]
+        total_chunks = len(boundaries)
+
+        for chunk_num, (start, end) in enumerate(boundaries, start=1):
+            # chunk lines plus context from next chunk if available
+            context_end = min(end + context_lines, total_lines)
+            yield DiffChunk(
+                filepath=filepath,
+                chunk_number=chunk_num,
+                content=diff_content[offsets[start] : offsets[context_end] - 1],
+                start_line=start + 1,
+                end_line=end,
+                total_chunks=total_chunks,
+            )
 
     @staticmethod
-    def _find_breakpoint(lines: List[str], start: int, end: int) -> int:
+    def _find_breakpoint(lines: List[bytes], start: int, end: int) -> int:
         """find a good breakpoint in the diff (function/class boundary or empty line).
 
         Args:
@@ -139,11 +131,11 @@ class DiffProcessor:
                 return i + 1
 
             # function/class definitions (common patterns)
-            if stripped.startswith(("def ", "class ", "function ", "@")):
+            if stripped.startswith((b"def ", b"class ", b"function ", b"@")):
                 return i + 1
 
             # closing braces/brackets
-            if stripped in ("}", "]", ")"):
+            if stripped in (b"}", b"]", b")"):
                 return i + 1
 
         # no good breakpoint found, use end
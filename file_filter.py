@@ -8,8 +8,19 @@ from typing import List, Optional, Tuple
 from config import Config
 from gitlab_fetcher import FileChange
 
-
-@dataclass
+# skip reasons in order of precedence: (reason, substrings, suffixes) matched against the lowercased path
+_SKIP_REASONS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("lock file", ("lock",), ()),
+    ("minified file", (".min.",), ()),
+    ("build artifact", ("dist/", "build/", "target/"), ()),
+    ("Python cache file", ("__pycache__",), (".pyc", ".pyo")),
+    ("generated code", ("_pb2.py", ".generated."), ()),
+    ("image file", (), (".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico")),
+    ("binary/archive file", (), (".pdf", ".zip", ".tar", ".gz")),
+)
+
+
+@dataclass(slots=True)
 class FilteredFile:
     """represents a file after filtering and analysis."""
 
@@ -21,6 +32,7 @@ class FilteredFile:
     note_only: bool = False
     size_kb: float = 0.0
     line_count: int = 0
+    lines: Optional[List[bytes]] = None  # split diff lines for files to be chunked, released once chunked
 
 
 class FileFilter:
@@ -43,29 +55,34 @@ class FileFilter:
 
         for file_change in file_changes:
             filepath = file_change.new_path or file_change.old_path
+            filepath_lower = filepath.lower()
 
             # check if should skip
-            if Config.should_skip_file(filepath):
-                reason = self._get_skip_reason(filepath)
+            if Config.should_skip_file(filepath, filepath_lower):
+                reason = self._get_skip_reason(filepath, filepath_lower)
                 self.skipped_files.append((filepath, reason))
                 continue
 
             # check if note only
-            note_only = Config.should_note_only(filepath)
+            note_only = Config.should_note_only(filepath, filepath_lower)
 
             # calculate file size and line count
-            size_kb = len(file_change.diff.encode("utf-8")) / 1024.0
-            line_count = file_change.diff.count("\n")
+            diff = file_change.diff
+            size_kb = len(diff) / 1024.0
+            line_count = diff.count(b"\n")
 
             # determine if should chunk (based on line count and size)
             should_chunk = line_count > Config.CHUNK_SIZE_LINES or size_kb > Config.MAX_FILE_SIZE_KB
 
             # get priority
-            priority = Config.get_file_priority(filepath)
+            priority = Config.get_file_priority(filepath, filepath_lower)
 
             # determine if should review (skip if note_only or deleted)
             should_review = not note_only and file_change.status != "deleted"
 
+            # only files that will actually be chunked need their lines split
+            lines = diff.split(b"\n") if should_chunk and should_review else None
+
             filtered_file = FilteredFile(
                 file_change=file_change,
                 should_review=should_review,
@@ -74,6 +91,7 @@ class FileFilter:
                 note_only=note_only,
                 size_kb=size_kb,
                 line_count=line_count,
+                lines=lines,
             )
 
             filtered.append(filtered_file)
@@ -89,21 +107,11 @@ class FileFilter:
         return self.skipped_files
 
     @staticmethod
-    def _get_skip_reason(filepath: str) -> str:
+    def _get_skip_reason(filepath: str, filepath_lower: Optional[str] = None) -> str:
         """get human-readable reason for skipping a file."""
-        if filepath.endswith(".lock") or "lock" in filepath.lower():
-            return "lock file"
-        elif ".min." in filepath.lower():
-            return "minified file"
-        elif any(pattern in filepath.lower() for pattern in ["dist/", "build/", "target/"]):
-            return "build artifact"
-        elif "__pycache__" in filepath or filepath.endswith((".pyc", ".pyo")):
-            return "Python cache file"
-        elif "_pb2.py" in filepath or ".generated." in filepath:
-            return "generated code"
-        elif filepath.endswith((".png", ".jpg", ".jpeg", ".gif", ".svg", ".ico")):
-            return "image file"
-        elif filepath.endswith((".pdf", ".zip", ".tar", ".gz")):
-            return "binary/archive file"
-        else:
-            return "matches skip pattern"
+        if filepath_lower is None:
+            filepath_lower = filepath.lower()
+        for reason, substrings, suffixes in _SKIP_REASONS:
+            if filepath_lower.endswith(suffixes) or any(substring in filepath_lower for substring in substrings):
+                return reason
+        return "matches skip pattern"
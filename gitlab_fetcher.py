@@ -2,31 +2,39 @@
 Fetches merge request data from GitLab API or local git repository.
 """
 
+from __future__ import annotations
+
 import logging
+import re
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
-
-import gitlab
-from git import Repo
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 from config import Config
 
+if TYPE_CHECKING:
+    # python-gitlab and GitPython are slow to import, so each is only imported by the code path that needs it
+    import gitlab
+    from git import Repo
+
 logger = logging.getLogger(__name__)
 
+# added/removed diff lines, excluding the "+++"/"---" file headers
+_CHANGE_LINE_RE = re.compile(rb"^([+-])(?!\1\1)", re.MULTILINE)
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class FileChange:
     """represents a single file change in a merge request."""
 
     old_path: str
     new_path: str
-    diff: str
+    diff: bytes  # raw UTF-8 diff text
     status: str  # 'added', 'modified', 'deleted', 'renamed'
     additions: int
     deletions: int
 
 
-@dataclass
+@dataclass(slots=True)
 class MRData:
     """represents merge request metadata and changes."""
 
@@ -56,11 +64,16 @@ class GitLabFetcher:
         self.url = url or Config.GITLAB_URL
         self.gitlab_client: Optional[gitlab.Gitlab] = None
 
-        if self.token:
+    def _get_gitlab_client(self) -> Optional[gitlab.Gitlab]:
+        """get GitLab client, creating it on first use."""
+        if self.gitlab_client is None and self.token:
+            import gitlab
+
             try:
                 self.gitlab_client = gitlab.Gitlab(self.url, private_token=self.token)
             except Exception as e:
                 logger.warning(f"failed to initialize GitLab client: {e}")
+        return self.gitlab_client
 
     def fetch_mr(self, mr_iid: int) -> MRData:
         """fetch merge request data from GitLab API.
@@ -74,13 +87,14 @@ class GitLabFetcher:
         Raises:
             ValueError: if GitLab client or project ID is not configured
         """
-        if not self.gitlab_client:
+        gitlab_client = self._get_gitlab_client()
+        if not gitlab_client:
             raise ValueError("GitLab token not configured. Use --branch for local git diff instead.")
 
         if not self.project_id:
             raise ValueError("GitLab project ID is required. Use --project-id to specify it.")
 
-        project = self.gitlab_client.projects.get(self.project_id)
+        project = gitlab_client.projects.get(self.project_id)
         mr = project.mergerequests.get(mr_iid)
 
         # get MR changes
@@ -88,13 +102,15 @@ class GitLabFetcher:
 
         file_changes = []
         for change in changes.get("changes", []):
+            diff_text = change.get("diff", "").encode("utf-8")
+            additions, deletions = self._count_changes(diff_text)
             file_change = FileChange(
                 old_path=change.get("old_path", ""),
                 new_path=change.get("new_path", ""),
-                diff=change.get("diff", ""),
+                diff=diff_text,
                 status=self._determine_status(change),
-                additions=change.get("diff", "").count("\n+") - change.get("diff", "").count("\n+++"),
-                deletions=change.get("diff", "").count("\n-") - change.get("diff", "").count("\n---"),
+                additions=additions,
+                deletions=deletions,
             )
             file_changes.append(file_change)
 
@@ -139,6 +155,8 @@ class GitLabFetcher:
     @staticmethod
     def _get_repo() -> Repo:
         """get git repository instance."""
+        from git import Repo
+
         try:
             return Repo(".", search_parent_directories=True)
         except Exception as e:
@@ -162,14 +180,10 @@ class GitLabFetcher:
             old_path = diff_item.a_path if diff_item.a_path else ""
             new_path = diff_item.b_path if diff_item.b_path else ""
 
-            # get diff text
-            if diff_item.diff:
-                if isinstance(diff_item.diff, bytes):
-                    diff_text = diff_item.diff.decode("utf-8", errors="ignore")
-                else:
-                    diff_text = diff_item.diff
-            else:
-                diff_text = ""
+            # get diff text (kept as bytes exactly as git produced it)
+            diff_text = diff_item.diff or b""
+            if isinstance(diff_text, str):
+                diff_text = diff_text.encode("utf-8")
 
             # determine status
             if diff_item.new_file:
@@ -182,8 +196,7 @@ class GitLabFetcher:
                 status = "modified"
 
             # count additions and deletions
-            additions = diff_text.count("\n+") - diff_text.count("\n+++")
-            deletions = diff_text.count("\n-") - diff_text.count("\n---")
+            additions, deletions = GitLabFetcher._count_changes(diff_text)
 
             file_change = FileChange(
                 old_path=old_path,
@@ -196,6 +209,13 @@ class GitLabFetcher:
             file_changes.append(file_change)
         return file_changes
 
+    @staticmethod
+    def _count_changes(diff_text: bytes) -> Tuple[int, int]:
+        """count added and removed lines in a single scan of the diff."""
+        markers = _CHANGE_LINE_RE.findall(diff_text)
+        additions = markers.count(b"+")
+        return additions, len(markers) - additions
+
     @staticmethod
     def _extract_commit_info(source_commit, source_branch: str, target_branch: str) -> Tuple[str, str]:
         """extract commit message and author name."""
@@ -9,6 +9,8 @@ from __future__ import annotations
 import argparse
 import logging
 import sys
+from collections import Counter
+from typing import Dict, Iterator, List
 
 from dotenv import load_dotenv
 
@@ -16,8 +18,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from config import Config
-from diff_processor import DiffProcessor
-from file_filter import FileFilter
+from diff_processor import DiffChunk, DiffProcessor
+from file_filter import FileFilter, FilteredFile
 from gitlab_fetcher import GitLabFetcher, MRData
 from output_generator import OutputGenerator
 
@@ -26,7 +28,20 @@ logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(
 logger = logging.getLogger(__name__)
 
 
-def _print_summary(mr_data: MRData, review_files: list, skipped_count: int, all_chunks: list, output_path: str):
+def _iter_chunks(
+    processor: DiffProcessor, review_files: List[FilteredFile], stats: Dict[str, int]
+) -> Iterator[DiffChunk]:
+    """yield diff chunks for each file to review, counting them into stats as they are produced."""
+    for filtered_file in review_files:
+        for chunk in processor.process_file(filtered_file):
+            if chunk.total_chunks > 1 and chunk.chunk_number == 1:
+                stats["chunked"] += chunk.total_chunks
+                logger.info(f"  Chunked {chunk.filepath} into {chunk.total_chunks} chunks")
+            stats["total"] += 1
+            yield chunk
+
+
+def _print_summary(mr_data: MRData, review_files: list, skipped_count: int, diff_file_count: int, output_path: str):
     """print summary of review preparation."""
     logger.info("\n%s", "=" * 70)
     logger.info("MR Bot: Review Preparation Complete")
@@ -36,18 +51,17 @@ def _print_summary(mr_data: MRData, review_files: list, skipped_count: int, all_
     logger.info(f"  - MR_{mr_data.iid}_info.md (MR metadata)")
     logger.info("  - review_prompt.md (instructions for Cursor agent)")
     logger.info("  - skipped_files.md (list of excluded files)")
-    logger.info(f"  - diffs/ (directory with {len(all_chunks)} diff files)")
+    logger.info(f"  - diffs/ (directory with {diff_file_count} diff files)")
 
     logger.info("\nStatistics:")
     logger.info(f"  - Total file changes: {len(mr_data.file_changes)}")
     logger.info(f"  - Files to review: {len(review_files)}")
     logger.info(f"  - Files skipped: {skipped_count}")
-    logger.info(f"  - Diff files created: {len(all_chunks)}")
+    logger.info(f"  - Diff files created: {diff_file_count}")
 
     # priority breakdown
-    critical = len([f for f in review_files if f.priority == "critical"])
-    normal = len([f for f in review_files if f.priority == "normal"])
-    low = len([f for f in review_files if f.priority == "low"])
+    priority_counts = Counter(f.priority for f in review_files)
+    critical, normal, low = priority_counts["critical"], priority_counts["normal"], priority_counts["low"]
 
     if critical > 0 or normal > 0 or low > 0:
         logger.info("\nPriority breakdown:")
@@ -138,31 +152,18 @@ Examples:
         logger.info(f"Files to review: {len(review_files)}")
         logger.info(f"Files skipped: {skipped_count}")
 
-        # process diffs
+        # process diffs and generate output (each chunk is written before the next is built)
         logger.info("Processing diffs...")
-        all_chunks = []
-        chunk_count = 0
-
-        for filtered_file in filtered_files:
-            if filtered_file.should_review:
-                chunks = processor.process_file(filtered_file)
-                all_chunks.extend(chunks)
-                if len(chunks) > 1:
-                    chunk_count += len(chunks)
-                    logger.info(
-                        f"  Chunked {filtered_file.file_change.new_path or filtered_file.file_change.old_path} into {len(chunks)} chunks"
-                    )
-
-        logger.info(f"Total diff files created: {len(all_chunks)}")
-        if chunk_count > 0:
-            logger.info(f"  ({chunk_count} chunks from large files)")
-
-        # generate output
         logger.info(f"Generating output in {output_dir}...")
-        output_path = generator.generate_output(mr_data, filtered_files, all_chunks)
+        stats = {"total": 0, "chunked": 0}
+        output_path = generator.generate_output(mr_data, filtered_files, _iter_chunks(processor, review_files, stats))
+
+        logger.info(f"Total diff files created: {stats['total']}")
+        if stats["chunked"] > 0:
+            logger.info(f"  ({stats['chunked']} chunks from large files)")
 
         # print summary
-        _print_summary(mr_data, review_files, skipped_count, all_chunks, output_path)
+        _print_summary(mr_data, review_files, skipped_count, stats["total"], output_path)
 
     except ValueError as e:
         logger.error(f"Error: {e}")
@@ -2,91 +2,25 @@
 Generates organized output files for Cursor agent review.
 """
 
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional
+from typing import Deque, Dict, Final, Iterable, List, Optional, Set, Union
 
 from config import Config
 from diff_processor import DiffChunk
 from file_filter import FilteredFile
 from gitlab_fetcher import MRData
 
+# path separators replaced in diff file names
+_SEP_TABLE = str.maketrans({"/": "__", "\\": "__"})
 
-class OutputGenerator:
-    """generates output files for review."""
-
-    def __init__(self, output_dir: Optional[str] = None):
-        """initialize output generator.
-
-        Args:
-            output_dir: output directory path (defaults to config)
-        """
-        self.output_dir = Path(output_dir or Config.DEFAULT_OUTPUT_DIR)
-        self.diffs_dir = self.output_dir / "diffs"
-
-    def generate_output(self, mr_data: MRData, filtered_files: List[FilteredFile], chunks: List[DiffChunk]) -> str:
-        """generate all output files.
-
-        Args:
-            mr_data: merge request metadata
-            filtered_files: list of filtered files
-            chunks: list of diff chunks
-
-        Returns:
-            path to output directory
-        """
-        # create directories
-        self.output_dir.mkdir(parents=True, exist_ok=True)
-        self.diffs_dir.mkdir(parents=True, exist_ok=True)
+# number of threads writing diff files
+_DIFF_WRITE_WORKERS: Final[int] = 8
 
-        # generate files
-        self._generate_mr_info(mr_data)
-        self._generate_review_prompt(mr_data, filtered_files, chunks)
-        self._generate_skipped_files(filtered_files)
-        self._generate_diff_files(chunks)
-
-        return str(self.output_dir)
-
-    def _generate_mr_info(self, mr_data: MRData):
-        """generate MR metadata file."""
-        info_path = self.output_dir / f"MR_{mr_data.iid}_info.md"
-
-        content = f"""# Merge Request Information
-
-## Basic Info
-- **IID**: {mr_data.iid}
-- **Title**: {mr_data.title}
-- **Author**: {mr_data.author}
-- **Source Branch**: `{mr_data.source_branch}`
-- **Target Branch**: `{mr_data.target_branch}`
-"""
-
-        if mr_data.web_url:
-            content += f"- **URL**: {mr_data.web_url}\n"
-
-        if mr_data.description:
-            content += f"\n## Description\n\n{mr_data.description}\n"
-
-        with open(info_path, "w", encoding="utf-8") as file_handle:
-            file_handle.write(content)
-
-    def _generate_review_prompt(self, mr_data: MRData, filtered_files: List[FilteredFile], chunks: List[DiffChunk]):
-        """generate review prompt for Cursor agent."""
-        prompt_path = self.output_dir / "review_prompt.md"
-
-        # get files to review
-        review_files = [f for f in filtered_files if f.should_review]
-        critical_files = [f for f in review_files if f.priority == "critical"]
-        normal_files = [f for f in review_files if f.priority == "normal"]
-        low_files = [f for f in review_files if f.priority == "low"]
-
-        # get chunk file paths
-        chunk_files = []
-        for chunk in chunks:
-            filepath = chunk.filepath.replace("/", "__")
-            filename = f"{filepath}_chunk_{chunk.chunk_number}.diff" if chunk.total_chunks > 1 else f"{filepath}.diff"
-            chunk_files.append(f"diffs/{filename}")
-
-        content = """# Code Review Instructions
+# static sections of the review prompt; file lists are inserted between them
+_REVIEW_PROMPT_HEADER: Final[str] = """# Code Review Instructions
 
 ## Role
 
@@ -168,23 +102,7 @@ For each issue found, provide:
 ### Critical Priority Files
 """
 
-        for f in critical_files:
-            filepath = f.file_change.new_path or f.file_change.old_path
-            content += f"- `{filepath}`\n"
-
-        if normal_files:
-            content += "\n### Normal Priority Files\n"
-            for f in normal_files:
-                filepath = f.file_change.new_path or f.file_change.old_path
-                content += f"- `{filepath}`\n"
-
-        if low_files:
-            content += "\n### Low Priority Files\n"
-            for f in low_files:
-                filepath = f.file_change.new_path or f.file_change.old_path
-                content += f"- `{filepath}`\n"
-
-        content += """
+_REVIEW_PROMPT_DIFFS_HEADER: Final[str] = """
 
 ## Diff Files
 
@@ -192,10 +110,7 @@ Review the following diff files in the `diffs/` directory:
 
 """
 
-        for chunk_file in sorted(chunk_files):
-            content += f"- `{chunk_file}`\n"
-
-        content += """
+_REVIEW_PROMPT_FOOTER: Final[str] = """
 
 ## Review Process
 
@@ -216,52 +131,210 @@ Review the following diff files in the `diffs/` directory:
 Begin your review now. Review all diff files and provide your findings in the structured format above. Write your review to the file `output/code_review.md`.
 """
 
-        with open(prompt_path, "w", encoding="utf-8") as file_handle:
-            file_handle.write(content)
 
-    def _generate_skipped_files(self, filtered_files: List[FilteredFile]):
-        """generate skipped files documentation."""
-        skipped_path = self.output_dir / "skipped_files.md"
+class OutputGenerator:
+    """generates output files for review."""
 
-        # collect skipped files
-        skipped = []
+    def __init__(self, output_dir: Optional[str] = None):
+        """initialize output generator.
+
+        Args:
+            output_dir: output directory path (defaults to config)
+        """
+        self.output_dir = Path(output_dir or Config.DEFAULT_OUTPUT_DIR)
+        self.diffs_dir = self.output_dir / "diffs"
+
+    def generate_output(self, mr_data: MRData, filtered_files: List[FilteredFile], chunks: Iterable[DiffChunk]) -> str:
+        """generate all output files.
+
+        Args:
+            mr_data: merge request metadata
+            filtered_files: list of filtered files
+            chunks: diff chunks, written to disk one at a time as they are consumed
+
+        Returns:
+            path to output directory
+        """
+        # create directories
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.diffs_dir.mkdir(parents=True, exist_ok=True)
+
+        # sort files into review priorities and skipped files in a single pass
+        review_files: Dict[str, List[FilteredFile]] = {"critical": [], "normal": [], "low": []}
+        skipped_files: List[FilteredFile] = []
         for f in filtered_files:
+            if f.should_review:
+                review_files[f.priority].append(f)
             if not f.should_review or f.note_only:
+                skipped_files.append(f)
+
+        # generate files
+        self._generate_mr_info(mr_data)
+        chunk_files = self._generate_diff_files(chunks)
+        self._generate_review_prompt(mr_data, review_files, chunk_files)
+        self._generate_skipped_files(skipped_files)
+
+        return str(self.output_dir)
+
+    def _generate_mr_info(self, mr_data: MRData):
+        """generate MR metadata file."""
+        info_path = self.output_dir / f"MR_{mr_data.iid}_info.md"
+
+        content = f"""# Merge Request Information
+
+## Basic Info
+- **IID**: {mr_data.iid}
+- **Title**: {mr_data.title}
+- **Author**: {mr_data.author}
+- **Source Branch**: `{mr_data.source_branch}`
+- **Target Branch**: `{mr_data.target_branch}`
+"""
+
+        if mr_data.web_url:
+            content += f"- **URL**: {mr_data.web_url}\n"
+
+        if mr_data.description:
+            content += f"\n## Description\n\n{mr_data.description}\n"
+
+        info_path.write_bytes(content.encode("utf-8"))
+
+    def _generate_review_prompt(
+        self, mr_data: MRData, review_files: Dict[str, List[FilteredFile]], chunk_files: List[str]
+    ):
+        """generate review prompt for Cursor agent."""
+        prompt_path = self.output_dir / "review_prompt.md"
+
+        critical_files = review_files["critical"]
+        normal_files = review_files["normal"]
+        low_files = review_files["low"]
+
+        parts: List[str] = [_REVIEW_PROMPT_HEADER]
+
+        for f in critical_files:
+            filepath = f.file_change.new_path or f.file_change.old_path
+            parts.append(f"- `{filepath}`\n")
+
+        if normal_files:
+            parts.append("\n### Normal Priority Files\n")
+            for f in normal_files:
                 filepath = f.file_change.new_path or f.file_change.old_path
-                reason = f.skip_reason or ("noted but not reviewed" if f.note_only else "skipped")
-                skipped.append((filepath, reason))
+                parts.append(f"- `{filepath}`\n")
 
-        content = "# Skipped Files\n\n"
-        content += "The following files were excluded from AI review:\n\n"
+        if low_files:
+            parts.append("\n### Low Priority Files\n")
+            for f in low_files:
+                filepath = f.file_change.new_path or f.file_change.old_path
+                parts.append(f"- `{filepath}`\n")
 
-        if not skipped:
-            content += "No files were skipped.\n"
-        else:
-            content += "| File Path | Reason |\n"
-            content += "|-----------|--------|\n"
-            for filepath, reason in skipped:
-                content += f"| `{filepath}` | {reason} |\n"
+        parts.append(_REVIEW_PROMPT_DIFFS_HEADER)
+        # diff files are listed in the order they were generated: MR file order, chunks in sequence
+        parts.extend(f"- `{chunk_file}`\n" for chunk_file in chunk_files)
+        parts.append(_REVIEW_PROMPT_FOOTER)
+
+        content = "".join(parts)
+        prompt_path.write_bytes(content.encode("utf-8"))
+
+    def _generate_skipped_files(self, skipped_files: List[FilteredFile]):
+        """generate skipped files documentation."""
+        skipped_path = self.output_dir / "skipped_files.md"
 
-        with open(skipped_path, "w", encoding="utf-8") as file_handle:
-            file_handle.write(content)
+        # collect skipped files
+        skipped = []
+        for f in skipped_files:
+            filepath = f.file_change.new_path or f.file_change.old_path
+            reason = f.skip_reason or ("noted but not reviewed" if f.note_only else "skipped")
+            skipped.append((filepath, reason))
 
-    def _generate_diff_files(self, chunks: List[DiffChunk]):
-        """generate individual diff files."""
-        for chunk in chunks:
-            # sanitize filepath for filename
-            filepath = chunk.filepath.replace("/", "__").replace("\\", "__")
+        parts = ["# Skipped Files\n\n", "The following files were excluded from AI review:\n\n"]
 
-            filename = f"{filepath}_chunk_{chunk.chunk_number}.diff" if chunk.total_chunks > 1 else f"{filepath}.diff"
+        if not skipped:
+            parts.append("No files were skipped.\n")
+        else:
+            parts.append("| File Path | Reason |\n|-----------|--------|\n")
+            parts.append("\n".join(f"| `{filepath}` | {reason} |" for filepath, reason in skipped))
+            parts.append("\n")
 
-            diff_path = self.diffs_dir / filename
+        content = "".join(parts)
+        skipped_path.write_bytes(content.encode("utf-8"))
 
-            # add chunk header
-            header = f"# Diff: {chunk.filepath}"
-            if chunk.total_chunks > 1:
-                header += f" (Chunk {chunk.chunk_number} of {chunk.total_chunks})"
-            header += f"\n# Lines {chunk.start_line}-{chunk.end_line}\n\n"
+    def _generate_diff_files(self, chunks: Iterable[DiffChunk]) -> List[str]:
+        """generate individual diff files.
 
-            content = header + chunk.content
+        Files are written on a small thread pool so the writes overlap with building the next
+        chunks; the number of writes in flight is bounded so chunks are not buffered in memory.
 
-            with open(diff_path, "w", encoding="utf-8") as file_handle:
+        Returns:
+            paths of the generated diff files, relative to the output directory
+        """
+        chunk_files = []
+        used_filenames: Set[str] = set()
+        pending: Deque[Future] = deque()
+
+        with ThreadPoolExecutor(max_workers=_DIFF_WRITE_WORKERS) as executor:
+            for chunk in chunks:
+                filename = self._diff_filename(chunk)
+                # different paths can sanitize to the same name (a/b.py, a__b.py); give each its own file
+                # so concurrent writes never target the same path
+                if filename in used_filenames:
+                    filename = self._unique_filename(filename, used_filenames)
+                used_filenames.add(filename)
+
+                # add chunk header
+                header = f"# Diff: {chunk.filepath}"
+                if chunk.total_chunks > 1:
+                    header += f" (Chunk {chunk.chunk_number} of {chunk.total_chunks})"
+                header += f"\n# Lines {chunk.start_line}-{chunk.end_line}\n\n"
+
+                pending.append(executor.submit(self._write_diff_file, self.diffs_dir / filename, header, chunk.content))
+                if len(pending) >= 2 * _DIFF_WRITE_WORKERS:
+                    pending.popleft().result()
+
+                chunk_files.append(f"diffs/{filename}")
+
+            # surface any write errors
+            for future in pending:
+                future.result()
+
+        return chunk_files
+
+    @staticmethod
+    def _diff_filename(chunk: DiffChunk) -> str:
+        """get the diff file name for a chunk, with path separators sanitized."""
+        filepath = chunk.filepath.translate(_SEP_TABLE)
+        if chunk.total_chunks > 1:
+            return f"{filepath}_chunk_{chunk.chunk_number}.diff"
+        return f"{filepath}.diff"
+
+    @staticmethod
+    def _unique_filename(filename: str, used_filenames: Set[str]) -> str:
+        """get a variant of a diff file name that is not in used_filenames."""
+        stem = filename.removesuffix(".diff")
+        suffix = 2
+        while f"{stem}_{suffix}.diff" in used_filenames:
+            suffix += 1
+        return f"{stem}_{suffix}.diff"
+
+    @staticmethod
+    def _write_diff_file(diff_path: Path, header: str, content: bytes):
+        """write a single diff file, passing header and content to the kernel without joining them."""
+        header_bytes = header.encode("utf-8")
+
+        if not hasattr(os, "writev"):  # not available on Windows
+            with open(diff_path, "wb") as file_handle:
+                file_handle.write(header_bytes)
                 file_handle.write(content)
+            return
+
+        fd = os.open(diff_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            buffers: List[Union[bytes, memoryview]] = [header_bytes, content]
+            while buffers:
+                written = os.writev(fd, buffers)
+                # drop fully written buffers and trim a partially written one
+                while buffers and written >= len(buffers[0]):
+                    written -= len(buffers[0])
+                    buffers.pop(0)
+                if buffers:
+                    buffers[0] = memoryview(buffers[0])[written:]
+        finally:
+            os.close(fd)
@@ -10,18 +10,30 @@ from __future__ import annotations
 
 import json
 import os
+import queue
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import IO, Any, Callable
 
 try:
     import yaml  # type: ignore[import-untyped]
 except ImportError:
     yaml = None  # type: ignore[assignment]
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+# parses one stream-json event from raw bytes (orjson is faster when available)
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 from rich.console import Console  # type: ignore[import-untyped]
 from rich.panel import Panel  # type: ignore[import-untyped]
 from rich.rule import Rule  # type: ignore[import-untyped]
@@ -29,6 +41,10 @@ from rich.rule import Rule  # type: ignore[import-untyped]
 console = Console()
 console_stderr = Console(file=sys.stderr)
 
+# "- **Source Branch**: `name`" line written by OutputGenerator._generate_mr_info
+_SOURCE_BRANCH_PREFIX = "- **Source Branch**:"
+_SOURCE_BRANCH_RE = re.compile(r"\*\*Source Branch\*\*:\s*`([^`]+)`")
+
 
 def load_config(config_path: str | Path) -> dict[str, Any]:
     """Load pipeline config from YAML file."""
@@ -59,9 +75,33 @@ def get_branch_from_mr_info(output_dir: Path, mr: int) -> str | None:
     info_path = output_dir / f"MR_{mr}_info.md"
     if not info_path.exists():
         return None
-    text = info_path.read_text(encoding="utf-8")
-    match = re.search(r"\*\*Source Branch\*\*:\s*`([^`]+)`", text)
-    return match.group(1).strip() if match else None
+    # written by OutputGenerator as raw bytes with "\n" line endings, so no newline translation is needed
+    with open(info_path, encoding="utf-8", newline="") as f:
+        for line in f:
+            if line.startswith(_SOURCE_BRANCH_PREFIX):
+                match = _SOURCE_BRANCH_RE.search(line)
+                return match.group(1).strip() if match else None
+    return None
+
+
+def remove_stale_dir(stale_dir: Path) -> None:
+    """Delete a previous run's output directory; warn (instead of raising) if any of it is left behind."""
+    shutil.rmtree(stale_dir, ignore_errors=True)
+    if stale_dir.exists():
+        console_stderr.print(
+            f"  [yellow]⚠[/] Could not fully delete previous output [cyan]{stale_dir}[/]; remove it manually."
+        )
+
+
+def clear_output_dir(output_dir: Path) -> None:
+    """Replace output_dir with an empty directory; the old contents are deleted in the background."""
+    if output_dir.exists():
+        # renaming is a single metadata operation; unlinking the previous run's files is left to a
+        # thread (not a daemon, so it still finishes if the pipeline exits early)
+        stale_dir = output_dir.with_name(f"{output_dir.name}.stale.{os.getpid()}.{time.time_ns()}")
+        output_dir.rename(stale_dir)
+        threading.Thread(target=remove_stale_dir, args=(stale_dir,)).start()
+    output_dir.mkdir(parents=True, exist_ok=True)
 
 
 def run_cmd(
@@ -71,7 +111,8 @@ def run_cmd(
     check: bool = True,
 ) -> subprocess.CompletedProcess:
     """Run a command; raise on non-zero exit if check=True."""
-    full_env = {**os.environ, **(env or {})}
+    # without overrides the child simply inherits our environment (no copy needed)
+    full_env = {**os.environ, **env} if env else None
     return subprocess.run(
         cmd,
         cwd=cwd or None,
@@ -81,6 +122,41 @@ def run_cmd(
     )
 
 
+def has_local_changes(target_repo: Path) -> bool:
+    """Return True if tracked files in target_repo have staged or unstaged changes."""
+    # exit status only, no output captured; untracked files are ignored since `git stash push` leaves them alone
+    returncode = subprocess.call(
+        ["git", "diff-index", "--quiet", "HEAD", "--"], cwd=target_repo, stderr=subprocess.DEVNULL
+    )
+    # 1 means changes; any other failure (e.g. 128 when HEAD does not exist yet in a repo without commits)
+    # leaves nothing `git stash push` could save, so it is treated as no changes
+    return returncode == 1
+
+
+def start_fetch(target_repo: Path, branch: str | None) -> subprocess.Popen | None:
+    """Start `git fetch origin <branch>` in the background if the branch and target repo are already known."""
+    if not branch or not (target_repo / ".git").exists():
+        return None
+    # stderr is held until finish_fetch so git's messages do not interleave with the steps running meanwhile
+    return subprocess.Popen(
+        ["git", "fetch", "origin", branch],
+        cwd=target_repo,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+
+
+def finish_fetch(fetch_proc: subprocess.Popen | None, target_repo: Path, branch: str) -> None:
+    """Wait for a fetch started by start_fetch, or fetch now if none was started; failures are not fatal."""
+    if fetch_proc is None:
+        run_cmd(["git", "fetch", "origin", branch], cwd=target_repo, check=False)
+        return
+    _, fetch_stderr = fetch_proc.communicate()
+    sys.stderr.write(fetch_stderr)
+
+
+@lru_cache(maxsize=2048)
 def _format_path(path: str, max_len: int = 60) -> str:
     """Truncate path for display."""
     if len(path) <= max_len:
@@ -88,50 +164,89 @@ def _format_path(path: str, max_len: int = 60) -> str:
     return "..." + path[-(max_len - 3) :]
 
 
-def _handle_stream_event(event: dict[str, Any]) -> bool:  # noqa: C901
-    """Handle one stream-json event; print progress. Return True if result/success (done)."""
+def _on_system_init(event: dict[str, Any]) -> str | None:
+    """Format agent start."""
+    model = event.get("model", "agent")
+    return f"  [dim]Agent started[/] ([cyan]{model}[/])"
+
+
+def _on_tool_call_started(event: dict[str, Any]) -> str | None:
+    """Format the file being read/written by a tool call."""
+    tc = event.get("tool_call") or {}
+    if "readToolCall" in tc:
+        path = (tc["readToolCall"].get("args") or {}).get("path", "?")
+        return f"  [dim]📖 Reading[/] [cyan]{_format_path(path)}[/]"
+    if "writeToolCall" in tc:
+        path = (tc["writeToolCall"].get("args") or {}).get("path", "?")
+        return f"  [dim]✏️  Writing[/] [cyan]{_format_path(path)}[/]"
+    return "  [dim]🔧 Tool call…[/]"
+
+
+def _on_tool_call_completed(event: dict[str, Any]) -> str | None:
+    """Format tool call completion (with lines written, if known)."""
+    tc = event.get("tool_call") or {}
+    if "writeToolCall" in tc:
+        res = (tc["writeToolCall"].get("result") or {}).get("success")
+        if isinstance(res, dict) and res.get("linesCreated") is not None:
+            return f"     [green]✓[/] [dim]{res['linesCreated']} lines[/]"
+    return "     [green]✓[/]"
+
+
+def _on_assistant(event: dict[str, Any]) -> str | None:
+    """Format a one-line preview of the first text block of an assistant message."""
+    msg = event.get("message") or {}
+    for block in msg.get("content") or []:
+        if isinstance(block, dict) and block.get("type") == "text":
+            text = (block.get("text") or "").strip()
+            if not text:
+                return None
+            preview = text[:80].replace("\n", " ")
+            if len(text) > 80:
+                preview += "…"
+            return f"  [dim]💬[/] [dim]{preview}[/]"
+    return None
+
+
+def _on_result_success(event: dict[str, Any]) -> str | None:
+    """Format completion time."""
+    duration_ms = event.get("duration_ms") or 0
+    return f"  [green]✓[/] [dim]Complete ({duration_ms / 1000:.1f}s)[/]"
+
+
+# stream-json event formatters keyed by (type, subtype); a None subtype matches any subtype
+_STREAM_EVENT_HANDLERS: dict[tuple[str | None, str | None], Callable[[dict[str, Any]], str | None]] = {
+    ("system", "init"): _on_system_init,
+    ("tool_call", "started"): _on_tool_call_started,
+    ("tool_call", "completed"): _on_tool_call_completed,
+    ("assistant", None): _on_assistant,
+    ("result", "success"): _on_result_success,
+}
+
+
+def _handle_stream_event(event: dict[str, Any]) -> str | None:
+    """Format one stream-json event as a progress line (None if it is not shown)."""
     event_type = event.get("type")
-    subtype = event.get("subtype")
-
-    if event_type == "system" and subtype == "init":
-        model = event.get("model", "agent")
-        console.print(f"  [dim]Agent started[/] ([cyan]{model}[/])")
-    elif event_type == "tool_call" and subtype == "started":
-        tc = event.get("tool_call") or {}
-        if "readToolCall" in tc:
-            path = (tc["readToolCall"].get("args") or {}).get("path", "?")
-            console.print(f"  [dim]📖 Reading[/] [cyan]{_format_path(path)}[/]")
-        elif "writeToolCall" in tc:
-            path = (tc["writeToolCall"].get("args") or {}).get("path", "?")
-            console.print(f"  [dim]✏️  Writing[/] [cyan]{_format_path(path)}[/]")
-        else:
-            console.print("  [dim]🔧 Tool call…[/]")
-    elif event_type == "tool_call" and subtype == "completed":
-        tc = event.get("tool_call") or {}
-        if "writeToolCall" in tc:
-            res = (tc["writeToolCall"].get("result") or {}).get("success")
-            if isinstance(res, dict) and res.get("linesCreated") is not None:
-                console.print(f"     [green]✓[/] [dim]{res['linesCreated']} lines[/]")
-            else:
-                console.print("     [green]✓[/]")
-        else:
-            console.print("     [green]✓[/]")
-    elif event_type == "assistant":
-        msg = event.get("message") or {}
-        for block in msg.get("content") or []:
-            if isinstance(block, dict) and block.get("type") == "text":
-                text = (block.get("text") or "").strip()
-                if text:
-                    preview = text[:80].replace("\n", " ")
-                    if len(text) > 80:
-                        preview += "…"
-                    console.print(f"  [dim]💬[/] [dim]{preview}[/]")
-                break
-    elif event_type == "result" and subtype == "success":
-        duration_ms = event.get("duration_ms") or 0
-        console.print(f"  [green]✓[/] [dim]Complete ({duration_ms / 1000:.1f}s)[/]")
-        return True
-    return False
+    handler = _STREAM_EVENT_HANDLERS.get((event_type, event.get("subtype")))
+    if handler is None:
+        handler = _STREAM_EVENT_HANDLERS.get((event_type, None))
+    return handler(event) if handler else None
+
+
+def _read_stream_events(stream: IO[bytes], events: queue.SimpleQueue[dict[str, Any] | None]) -> None:
+    """Parse stream-json lines into events on the queue; None marks the end of the stream."""
+    try:
+        # read raw bytes lines; both JSON parsers accept bytes and trailing whitespace
+        for line in stream:
+            if line.isspace():
+                continue
+            try:
+                event = _json_loads(line)
+            except ValueError:
+                continue
+            if isinstance(event, dict):
+                events.put(event)
+    finally:
+        events.put(None)
 
 
 def run_agent_with_progress(
@@ -150,25 +265,33 @@ def run_agent_with_progress(
     proc = subprocess.Popen(
         cmd,
         cwd=cwd,
-        env=os.environ,
         stdout=subprocess.PIPE,
         stderr=None,
-        text=True,
-        bufsize=1,
     )
     assert proc.stdout is not None
 
     with proc:
-        for line in proc.stdout:
-            line = line.rstrip("\n")
-            if not line:
-                continue
-            try:
-                event = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-            if isinstance(event, dict):
-                _handle_stream_event(event)
+        # events are parsed on a reader thread; every event that arrived since the last print is
+        # printed in one console call, so a chatty agent costs one render per batch, not per line
+        events: queue.SimpleQueue[dict[str, Any] | None] = queue.SimpleQueue()
+        reader = threading.Thread(target=_read_stream_events, args=(proc.stdout, events), daemon=True)
+        reader.start()
+        done = False
+        while not done:
+            batch = [events.get()]
+            while not events.empty():
+                batch.append(events.get_nowait())
+            lines = []
+            for event in batch:
+                if event is None:
+                    done = True
+                    break
+                line = _handle_stream_event(event)
+                if line is not None:
+                    lines.append(line)
+            if lines:
+                console.print("\n".join(lines))
+        reader.join()
 
     if proc.returncode != 0:
         raise subprocess.CalledProcessError(proc.returncode, cmd)
@@ -201,11 +324,12 @@ def main() -> None:
     console.print()
 
     # wipe output dir so we start fresh each run
-    if output_dir.exists():
-        shutil.rmtree(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
+    clear_output_dir(output_dir)
     console.print(f"  [dim]Cleared output directory:[/] [cyan]{output_dir}[/]\n")
 
+    # when the branch is configured, fetch it while steps 1-3 run instead of waiting for it before checkout
+    fetch_proc = start_fetch(target_repo, branch)
+
     # 1) Run main.py
     console.print(
         Panel(
@@ -274,29 +398,22 @@ def main() -> None:
     if not (target_repo / ".git").exists():
         console.print(f"[bold red]Error:[/] Target repo is not a git repo: [cyan]{target_repo}[/]")
         sys.exit(1)
-    status_result = subprocess.run(
-        ["git", "status", "--porcelain"],
-        cwd=target_repo,
-        capture_output=True,
-        text=True,
-        check=True,
-    )
-    had_changes = bool(status_result.stdout.strip())
+    had_changes = has_local_changes(target_repo)
     actually_stashed = False
     if had_changes:
         stash_result = subprocess.run(
             ["git", "stash", "push", "-m", "mr-bot pipeline: stashed before checkout"],
             cwd=target_repo,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,  # one merged buffer; the message below may be on either stream
             text=True,
             check=True,
         )
         # git stash push prints "No local changes to save" when there was nothing to stash (e.g. only untracked)
-        combined = (stash_result.stdout or "") + (stash_result.stderr or "")
-        actually_stashed = "No local changes to save" not in combined
+        actually_stashed = "No local changes to save" not in stash_result.stdout
         if actually_stashed:
             console.print("  [yellow]⚠[/] Local changes were [yellow]stashed[/] so the branch could be checked out.")
-    run_cmd(["git", "fetch", "origin", branch], cwd=target_repo, check=False)
+    finish_fetch(fetch_proc, target_repo, branch)
     run_cmd(["git", "checkout", branch], cwd=target_repo)
     if actually_stashed:
         console.print("  [dim]To restore later:[/] [cyan]git stash pop[/]\n")